@@ -5,12 +5,45 @@ TARGETS = []
 
 INTERVAL_MS = 60000  # 60 segundos entre cambios
 
+MATCH_MODE = "contains"  # "contains" (subcadena) o "fuzzy" (por similitud)
+FUZZY_THRESHOLD = 0.6  # Puntuación mínima (0.0 - 1.0) en modo fuzzy
+
+# -------------------------
+# Configuración de registro de eventos
+# -------------------------
+EVENT_LOG_CAPACITY = 1000  # Eventos recientes en memoria
+EVENT_LOG_DIR = "logs"  # None para no escribir a disco
+EVENT_LOG_MAX_BYTES = 1_000_000  # Tamaño máximo por archivo antes de rotar
+EVENT_LOG_BACKUP_COUNT = 3  # Archivos rotados que se conservan
+EVENT_LOG_VIEW_LIMIT = 200  # Eventos mostrados en la ventana de eventos
+
+# -------------------------
+# Rotación sincronizada entre instancias
+# -------------------------
+SYNC_ENABLED = False
+SYNC_NODE_ID = 0  # Índice de esta instancia en SYNC_PEERS (0 = líder preferido)
+SYNC_PEERS = [("127.0.0.1", 47800)]  # Todas las instancias, en orden de prioridad
+SYNC_EPOCH = 0.0  # Inicio del slot 0 (los slots duran INTERVAL_MS)
+
+# -------------------------
+# Grabación de trazas
+# -------------------------
+RECORD_TRACE_PATH = None  # Ej: "traces/kiosco.jsonl.gz" para grabar list/activate
+
+# -------------------------
+# Perfilado
+# -------------------------
+PROFILE_ENABLED = False  # También con: python main.py --profile
+PROFILE_SAMPLE_RATE = 1.0  # Fracción de ticks perfilados (0.0 - 1.0)
+PROFILE_MAX_EVENTS = 100_000  # Spans guardados en memoria
+PROFILE_DIR = "profiles"  # Trazas Chrome trace-event exportadas
+
 # -------------------------
 # Configuración de UI
 # -------------------------
 WINDOW_TITLE = "Window Switcher"
 WINDOW_WIDTH = 400  # Ancho
-WINDOW_HEIGHT = 350  # Alto
+WINDOW_HEIGHT = 390  # Alto
 WINDOW_ALWAYS_ON_TOP = True
 
 # Colores de estado
@@ -32,6 +32,20 @@ class BaseWindowController(ABC):
         """
         pass
 
+    def list_windows_for_lookup(self, text: str) -> List[Dict]:
+        """
+        Lista las ventanas para buscar en ellas el texto especificado.
+        Lo usa la búsqueda fuzzy del servicio; los controladores que
+        envuelven a otros pueden sobrescribirlo para registrar la búsqueda.
+        
+        Args:
+            text: Texto que se va a buscar
+            
+        Returns:
+            List[Dict]: Igual que list_windows
+        """
+        return self.list_windows()
+
     @abstractmethod
     def activate_window(self, hwnd: int) -> bool:
         """
@@ -0,0 +1,44 @@
+from typing import Dict, List, Optional
+
+from core.profiler import Profiler
+from .base_controller import BaseWindowController
+
+
+class ProfilingWindowController(BaseWindowController):
+    """
+    Controlador que envuelve a otro y mide cada llamada con el perfilador.
+    Si el controlador real tiene el atributo `profiler`, se le asigna para
+    que pueda medir sus fases internas.
+    """
+
+    def __init__(self, inner: BaseWindowController, profiler: Profiler):
+        self.inner = inner
+        self.profiler = profiler
+        if hasattr(inner, "profiler"):
+            inner.profiler = profiler
+
+    def list_windows(self) -> List[Dict]:
+        with self.profiler.span("list_windows"):
+            return self.inner.list_windows()
+
+    def list_windows_for_lookup(self, text: str) -> List[Dict]:
+        with self.profiler.span("list_windows"):
+            return self.inner.list_windows_for_lookup(text)
+
+    def find_window_by_title_contains(self, text: str) -> Optional[Dict]:
+        with self.profiler.span("find_window_by_title_contains", text=text):
+            return self.inner.find_window_by_title_contains(text)
+
+    def activate_window(self, hwnd: int) -> bool:
+        with self.profiler.span("activate_window", hwnd=hwnd):
+            return self.inner.activate_window(hwnd)
+
+    def get_application_windows(self) -> List[str]:
+        """Delegado al controlador real (no se mide)."""
+        return self.inner.get_application_windows()
+
+    def detach(self) -> BaseWindowController:
+        """Quita el perfilador del controlador real y lo devuelve."""
+        if hasattr(self.inner, "profiler"):
+            self.inner.profiler = None
+        return self.inner
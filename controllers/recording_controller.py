@@ -0,0 +1,178 @@
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, IO, List, Optional
+
+from .base_controller import BaseWindowController
+
+
+TRACE_VERSION = 1
+
+
+def open_trace(path: str, mode: str) -> IO[str]:
+    """Abre un archivo de traza en modo texto, comprimido si termina en .gz."""
+    if "w" in mode:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordingWindowController(BaseWindowController):
+    """
+    Controlador que envuelve a otro y graba en una traza cada snapshot de
+    list_windows y cada resultado de activate_window.
+    Los snapshots se guardan como diferencias respecto al anterior.
+
+    Formato (JSON-lines, una operación por línea):
+        {"op": "header", "version": 1, "start": <epoch>}
+        {"op": "find", "t": <s>, "text": <str>}
+        {"op": "list", "t": <s>, "add": [[hwnd, title, pid]], "del": [hwnd],
+         "upd": [[hwnd, title]], "order": [hwnd]}
+        {"op": "activate", "t": <s>, "hwnd": <int>, "ok": <bool>, "error": <str>}
+
+    La escritura (y la compresión) se hace en un hilo aparte que vuelca la
+    traza a disco como mucho cada FLUSH_INTERVAL segundos, de modo que si el
+    proceso muere solo se pierde el último tramo.
+    """
+
+    # Segundos máximos entre volcados a disco
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, inner: BaseWindowController, trace_path: str):
+        """
+        Inicializa la grabación.
+
+        Args:
+            inner: Controlador real al que se delegan las llamadas
+            trace_path: Ruta del archivo de traza (.gz para comprimir)
+        """
+        self.inner = inner
+        self.trace_path = trace_path
+        self._last: Dict[int, Dict] = {}
+        self._start = time.monotonic()
+        self._stream: Optional[IO[str]] = open_trace(trace_path, "w")
+        self._queue: "queue.SimpleQueue[Optional[Dict]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+        self._write({"op": "header", "version": TRACE_VERSION, "start": time.time()})
+
+    @property
+    def profiler(self):
+        """Perfilador del controlador real, para que mida sus fases internas."""
+        return getattr(self.inner, "profiler", None)
+
+    @profiler.setter
+    def profiler(self, value) -> None:
+        if hasattr(self.inner, "profiler"):
+            self.inner.profiler = value
+
+    def list_windows(self) -> List[Dict]:
+        windows = self.inner.list_windows()
+        self._record_snapshot(windows)
+        return windows
+
+    def find_window_by_title_contains(self, text: str) -> Optional[Dict]:
+        self._write({"op": "find", "t": self._elapsed(), "text": text})
+        text = text.lower()
+        for w in self.list_windows():
+            if text in w["title"].lower():
+                return w
+        return None
+
+    def list_windows_for_lookup(self, text: str) -> List[Dict]:
+        self._write({"op": "find", "t": self._elapsed(), "text": text})
+        return self.list_windows()
+
+    def activate_window(self, hwnd: int) -> bool:
+        try:
+            ok = self.inner.activate_window(hwnd)
+        except Exception as e:
+            self._write({"op": "activate", "t": self._elapsed(), "hwnd": hwnd, "ok": False, "error": str(e)})
+            raise
+        self._write({"op": "activate", "t": self._elapsed(), "hwnd": hwnd, "ok": ok})
+        return ok
+
+    def get_application_windows(self) -> List[str]:
+        """Delegado al controlador real (no se graba)."""
+        return self.inner.get_application_windows()
+
+    def close(self) -> None:
+        """Escribe los registros pendientes y cierra el archivo de traza."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _record_snapshot(self, windows: List[Dict]) -> None:
+        """Graba solo las diferencias respecto al snapshot anterior."""
+        current = {w["hwnd"]: w for w in windows}
+        record: Dict = {"op": "list", "t": self._elapsed()}
+
+        added = []
+        updated = []
+        for hwnd, w in current.items():
+            prev = self._last.get(hwnd)
+            if prev is None or prev["pid"] != w["pid"]:
+                added.append([hwnd, w["title"], w["pid"]])
+            elif prev["title"] != w["title"]:
+                updated.append([hwnd, w["title"]])
+        removed = [hwnd for hwnd in self._last if hwnd not in current]
+
+        # El orden (z-order) solo se graba si no coincide con el reconstruido
+        added_hwnds = {a[0] for a in added}
+        rebuilt = [hwnd for hwnd in self._last if hwnd in current and hwnd not in added_hwnds]
+        rebuilt += [a[0] for a in added]
+        order = list(current)
+        if rebuilt != order:
+            record["order"] = order
+
+        if added:
+            record["add"] = added
+        if removed:
+            record["del"] = removed
+        if updated:
+            record["upd"] = updated
+
+        self._last = current
+        self._write(record)
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._start, 4)
+
+    def _write(self, record: Dict) -> None:
+        # Si el escritor falló, los registros se descartan en vez de acumularse
+        if self._stream is not None:
+            self._queue.put(record)
+
+    def _run(self) -> None:
+        """Hilo escritor: serializa, comprime y vuelca la traza periódicamente."""
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    record = self._queue.get(timeout=self.FLUSH_INTERVAL)
+                    if record is None:
+                        break
+                    line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+                    self._stream.write(line + "\n")
+                except queue.Empty:
+                    pass
+
+                now = time.monotonic()
+                if now - last_flush >= self.FLUSH_INTERVAL:
+                    # En gzip hace un "sync flush": lo escrito ya se puede leer
+                    self._stream.flush()
+                    last_flush = now
+        except (OSError, TypeError, ValueError):
+            pass
+        finally:
+            stream, self._stream = self._stream, None
+            try:
+                stream.close()
+            except OSError:
+                pass
@@ -0,0 +1,119 @@
+import json
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from .base_controller import BaseWindowController
+from .recording_controller import TRACE_VERSION, open_trace
+
+
+class ReplayWindowController(BaseWindowController):
+    """
+    Controlador que reproduce una traza grabada con RecordingWindowController.
+    Cada llamada a list_windows devuelve el siguiente snapshot de la traza y
+    cada llamada a activate_window devuelve el resultado grabado.
+    """
+
+    def __init__(self, trace_path: str, realtime: bool = False):
+        """
+        Carga la traza.
+
+        Args:
+            trace_path: Ruta del archivo de traza
+            realtime: Si es True respeta los tiempos grabados; si no, va a máxima velocidad
+        """
+        self._records = self._load(trace_path)
+
+        if not self._records or self._records[0].get("op") != "header":
+            raise ValueError(f"Traza sin cabecera: {trace_path}")
+        if self._records[0].get("version") != TRACE_VERSION:
+            raise ValueError(f"Versión de traza no soportada: {self._records[0].get('version')}")
+
+        self.realtime = realtime
+        self._pos = 1
+        self._state: Dict[int, Dict] = {}
+        self._start: Optional[float] = None
+
+    @property
+    def exhausted(self) -> bool:
+        """True cuando ya no quedan snapshots por reproducir."""
+        return self._next_index("list") is None
+
+    def recorded_queries(self) -> List[str]:
+        """Textos buscados durante la grabación, en orden."""
+        return [r["text"] for r in self._records if r["op"] == "find"]
+
+    def list_windows(self) -> List[Dict]:
+        index = self._next_index("list")
+        if index is not None:
+            record = self._records[index]
+            self._pos = index + 1
+            self._wait_until(record["t"])
+            self._apply(record)
+        return list(self._state.values())
+
+    def find_window_by_title_contains(self, text: str) -> Optional[Dict]:
+        text = text.lower()
+        for w in self.list_windows():
+            if text in w["title"].lower():
+                return w
+        return None
+
+    def activate_window(self, hwnd: int) -> bool:
+        record = self._records[self._pos] if self._pos < len(self._records) else None
+        if record is None or record["op"] != "activate" or record["hwnd"] != hwnd:
+            # La secuencia se ha desviado de la grabación
+            return hwnd in self._state
+
+        self._pos += 1
+        self._wait_until(record["t"])
+        if "error" in record:
+            raise RuntimeError(record["error"])
+        return record["ok"]
+
+    def get_application_windows(self) -> List[str]:
+        """Títulos únicos del snapshot actual."""
+        return sorted({w["title"].strip() for w in self._state.values() if len(w["title"].strip()) > 1})
+
+    @staticmethod
+    def _load(trace_path: str) -> List[Dict]:
+        """
+        Lee los registros de la traza. Si la grabación se interrumpió (gzip
+        sin cerrar o última línea a medias) se conservan los registros completos.
+        """
+        records = []
+        with open_trace(trace_path, "r") as stream:
+            try:
+                for line in stream:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except (EOFError, zlib.error, json.JSONDecodeError):
+                pass
+        return records
+
+    def _next_index(self, op: str) -> Optional[int]:
+        for i in range(self._pos, len(self._records)):
+            if self._records[i]["op"] == op:
+                return i
+        return None
+
+    def _apply(self, record: Dict) -> None:
+        """Aplica las diferencias de un snapshot al estado actual."""
+        for hwnd in record.get("del", []):
+            self._state.pop(hwnd, None)
+        for hwnd, title, pid in record.get("add", []):
+            self._state.pop(hwnd, None)
+            self._state[hwnd] = {"hwnd": hwnd, "title": title, "pid": pid}
+        for hwnd, title in record.get("upd", []):
+            self._state[hwnd] = dict(self._state[hwnd], title=title)
+        if "order" in record:
+            self._state = {hwnd: self._state[hwnd] for hwnd in record["order"]}
+
+    def _wait_until(self, t: float) -> None:
+        if not self.realtime:
+            return
+        if self._start is None:
+            self._start = time.monotonic() - t
+        delay = self._start + t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
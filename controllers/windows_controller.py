@@ -1,5 +1,6 @@
 
 import time
+from contextlib import nullcontext
 import win32gui
 import win32process
 import win32con
@@ -11,6 +12,13 @@ from .base_controller import BaseWindowController
 
 class WindowsWindowController(BaseWindowController):
 
+    # Perfilador asignado por ProfilingWindowController (None = desactivado)
+    profiler = None
+
+    def _span(self, name: str):
+        """Span del perfilador, o un contexto vacío si está desactivado."""
+        return self.profiler.span(name) if self.profiler else nullcontext()
+
     def list_windows(self) -> List[Dict]:
         """
         Lista todas las ventanas visibles del sistema Windows.
@@ -27,7 +35,8 @@ class WindowsWindowController(BaseWindowController):
                     pid = win32process.GetWindowThreadProcessId(hwnd)[1]
                     windows.append({"hwnd": hwnd, "title": title, "pid": pid})
 
-        win32gui.EnumWindows(enum_handler, None)
+        with self._span("EnumWindows"):
+            win32gui.EnumWindows(enum_handler, None)
         return windows
 
     def find_window_by_title_contains(self, text: str) -> Optional[Dict]:
@@ -62,18 +71,26 @@ class WindowsWindowController(BaseWindowController):
 
         # 1) Si está minimizada, restaurar
         if win32gui.IsIconic(hwnd):
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            with self._span("restore"):
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
 
         # 2) Intento normal
-        win32gui.BringWindowToTop(hwnd)
-        win32gui.SetForegroundWindow(hwnd)
-        time.sleep(0.05)
+        with self._span("set_foreground"):
+            win32gui.BringWindowToTop(hwnd)
+            win32gui.SetForegroundWindow(hwnd)
+        with self._span("sleep"):
+            time.sleep(0.05)
 
         # 3) Verificación
         if win32gui.GetForegroundWindow() == hwnd:
             return True
 
         # 4) Fallback: AttachThreadInput (cuando Windows bloquea el foco)
+        with self._span("fallback"):
+            return self._activate_with_attached_input(hwnd)
+
+    def _activate_with_attached_input(self, hwnd: int) -> bool:
+        """Activa la ventana uniendo temporalmente las entradas de los hilos."""
         try:
             fg = win32gui.GetForegroundWindow()
             current_thread = win32api.GetCurrentThreadId()
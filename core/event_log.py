@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+# Tipos de evento del ciclo de cambio de ventanas
+EVENT_TICK = "tick"
+EVENT_RESOLVED = "resolved"
+EVENT_ACTIVATED = "activated"
+EVENT_FAILED = "failed"
+EVENT_SKIPPED = "skipped"
+
+# Tipos de evento de la aplicación
+EVENT_TARGET_ADDED = "target_added"
+EVENT_TARGET_REMOVED = "target_removed"
+EVENT_WINDOWS_REFRESHED = "windows_refreshed"
+EVENT_PROFILE_EXPORTED = "profile_exported"
+EVENT_PROFILE_EXPORT_FAILED = "profile_export_failed"
+
+
+class EventLog:
+    """
+    Registro estructurado de eventos.
+    Guarda los eventos recientes en un buffer circular en memoria y, si se
+    indica un directorio, los escribe en segundo plano en archivos JSON-lines
+    rotativos, de modo que el hilo de la GUI nunca espera por la E/S.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        log_dir: Optional[str] = None,
+        max_bytes: int = 1_000_000,
+        backup_count: int = 3
+    ):
+        """
+        Inicializa el registro de eventos.
+
+        Args:
+            capacity: Número máximo de eventos en memoria
+            log_dir: Directorio de los archivos JSON-lines (None = solo memoria)
+            max_bytes: Tamaño a partir del cual se rota el archivo
+            backup_count: Número de archivos rotados que se conservan
+        """
+        self._buffer: Deque[Dict] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+        self._writer: Optional[_JsonLinesWriter] = None
+        if log_dir:
+            self._writer = _JsonLinesWriter(log_dir, max_bytes, backup_count)
+
+    def emit(self, event_type: str, **fields) -> Dict:
+        """
+        Registra un evento.
+
+        Args:
+            event_type: Tipo de evento (tick, resolved, activated, failed, skipped...)
+            **fields: Datos adicionales del evento
+
+        Returns:
+            Dict: El evento registrado
+        """
+        event = {"ts": time.time(), "type": event_type}
+        event.update(fields)
+        with self._lock:
+            self._seq += 1
+            event["seq"] = self._seq
+            self._buffer.append(event)
+        if self._writer:
+            self._writer.put(event)
+        return event
+
+    def recent(self, limit: Optional[int] = None, event_type: Optional[str] = None) -> List[Dict]:
+        """
+        Obtiene los eventos más recientes, del más antiguo al más nuevo.
+
+        Args:
+            limit: Número máximo de eventos a devolver (None = todos)
+            event_type: Si se indica, filtra por tipo de evento
+
+        Returns:
+            List[Dict]: Copia de los eventos seleccionados
+        """
+        with self._lock:
+            events = list(self._buffer)
+        if event_type:
+            events = [e for e in events if e["type"] == event_type]
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    def clear(self) -> None:
+        """Vacía el buffer en memoria (no afecta a los archivos)."""
+        with self._lock:
+            self._buffer.clear()
+
+    @property
+    def dropped(self) -> int:
+        """Eventos que no llegaron a disco (cola llena o error de escritura)."""
+        return self._writer.dropped if self._writer else 0
+
+    def close(self) -> None:
+        """Vuelca los eventos pendientes a disco y detiene el escritor."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+
+class _JsonLinesWriter:
+    """Escritor asíncrono de eventos a archivos JSON-lines con rotación por tamaño."""
+
+    FILE_NAME = "events.jsonl"
+
+    # Eventos pendientes como máximo; si el disco no da abasto se descartan
+    QUEUE_SIZE = 100_000
+
+    def __init__(self, log_dir: str, max_bytes: int, backup_count: int):
+        os.makedirs(log_dir, exist_ok=True)
+        self._path = os.path.join(log_dir, self.FILE_NAME)
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, event: Dict) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        stream = self._open()
+        size = stream.tell() if stream else 0
+        rotate_at = self._max_bytes
+        try:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    break
+
+                try:
+                    line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+                except (TypeError, ValueError):
+                    # Evento no serializable: se descarta sin detener el escritor
+                    self.dropped += 1
+                    continue
+
+                if stream is None:
+                    stream = self._open()
+                    size = stream.tell() if stream else 0
+                    if stream is None:
+                        self.dropped += 1
+                        continue
+
+                try:
+                    stream.write(line)
+                    size += len(line)
+                    if size >= rotate_at:
+                        stream.close()
+                        if self._rotate():
+                            rotate_at = self._max_bytes
+                        else:
+                            # Archivo bloqueado (p. ej. abierto en un visor): reintentar más tarde
+                            rotate_at = size + max(1, self._max_bytes // 10)
+                        stream = self._open()
+                        size = stream.tell() if stream else 0
+                    elif self._queue.empty():
+                        # Solo se fuerza la escritura cuando la cola queda vacía
+                        stream.flush()
+                except OSError:
+                    self.dropped += 1
+                    stream = self._close_quietly(stream)
+        finally:
+            self._close_quietly(stream)
+
+    def _open(self):
+        """Abre el archivo de eventos, o devuelve None si no es posible."""
+        try:
+            return open(self._path, "ab")
+        except OSError:
+            return None
+
+    @staticmethod
+    def _close_quietly(stream) -> None:
+        if stream is not None:
+            try:
+                stream.close()
+            except OSError:
+                pass
+        return None
+
+    def _rotate(self) -> bool:
+        """
+        Rota events.jsonl -> events.jsonl.1 -> ... -> events.jsonl.N.
+
+        Returns:
+            bool: False si algún archivo estaba bloqueado y no se pudo rotar
+        """
+        try:
+            if self._backup_count <= 0:
+                os.remove(self._path)
+                return True
+            for i in range(self._backup_count - 1, 0, -1):
+                src = f"{self._path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self._path}.{i + 1}")
+            os.replace(self._path, f"{self._path}.1")
+            return True
+        except OSError:
+            return False
+
+
+def _run_bench(events: int) -> Dict:
+    """Mide el coste de emit() solo en memoria y con el escritor a disco."""
+    import tempfile
+
+    results = {"events": events}
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, directory in (("memory", None), ("file", log_dir)):
+            log = EventLog(log_dir=directory)
+            start = time.perf_counter()
+            for i in range(events):
+                log.emit(EVENT_TICK, target="Report.xlsx - Excel", index=i)
+            elapsed = time.perf_counter() - start
+            dropped = log.dropped
+            log.close()
+            results[f"{name}_us_per_event"] = round(elapsed / events * 1e6, 3)
+            if directory:
+                results["file_dropped"] = dropped
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registro estructurado de eventos")
+    parser.add_argument("--bench", action="store_true", help="Medir el coste por evento")
+    parser.add_argument("--events", type=int, default=100_000, help="Eventos a emitir en la medición")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(_run_bench(args.events), indent=2))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
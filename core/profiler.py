@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Deque, Dict, Iterator, List
+
+
+_NULL_SPAN = nullcontext()
+
+
+class Profiler:
+    """
+    Perfilador de ticks con spans anidados.
+    Solo registra los ticks muestreados (según sample_rate); fuera de ellos
+    span() devuelve un contexto vacío. Exporta en formato Chrome trace-event,
+    que se abre en chrome://tracing, Perfetto o speedscope.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_events: int = 100_000):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            sample_rate: Fracción de ticks que se registran (0.0 - 1.0)
+            max_events: Número máximo de spans guardados (se descartan los más antiguos)
+        """
+        self.sample_rate = sample_rate
+        self.max_events = max_events
+        self._events: Deque[Dict] = deque(maxlen=max_events)
+        self._active = False
+        self._pid = os.getpid()
+        self._origin_ns = time.perf_counter_ns()
+
+    def begin_tick(self) -> bool:
+        """
+        Decide si el tick actual se registra.
+
+        Returns:
+            bool: True si el tick está muestreado
+        """
+        self._active = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        return self._active
+
+    def end_tick(self) -> None:
+        """Marca el final del tick actual."""
+        self._active = False
+
+    def span(self, name: str, **args):
+        """
+        Mide un bloque de código dentro del tick actual.
+
+        Args:
+            name: Nombre del span
+            **args: Datos adicionales que se muestran en el visor
+        """
+        if not self._active:
+            return _NULL_SPAN
+        return self._record(name, args)
+
+    @contextmanager
+    def _record(self, name: str, args: Dict) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin_ns) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            self._events.append(event)
+
+    def events(self) -> List[Dict]:
+        """Copia de los spans registrados."""
+        return list(self._events)
+
+    def clear(self) -> None:
+        """Descarta los spans registrados."""
+        self._events.clear()
+
+    def export(self, path: str) -> int:
+        """
+        Exporta los spans en formato Chrome trace-event JSON.
+
+        Args:
+            path: Ruta del archivo de salida
+
+        Returns:
+            int: Número de spans exportados
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        events = self.events()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return len(events)
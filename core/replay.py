@@ -0,0 +1,86 @@
+"""
+Reproduce una traza grabada a través de WindowSwitcherService para medir
+el rendimiento de forma determinista (no requiere Windows ni GUI).
+
+Uso:
+    python -m core.replay traza.jsonl.gz [--realtime] [--targets "Excel" "Chrome"]
+                          [--match-mode fuzzy] [--fuzzy-threshold 0.6]
+"""
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+from controllers.replay_controller import ReplayWindowController
+from core.switcher_service import WindowSwitcherService, MATCH_CONTAINS, MATCH_FUZZY
+
+
+def replay_trace(
+    trace_path: str,
+    targets: Optional[List[str]] = None,
+    realtime: bool = False,
+    match_mode: str = MATCH_CONTAINS,
+    fuzzy_threshold: float = 0.6
+) -> Dict:
+    """
+    Reproduce una traza completa y devuelve estadísticas.
+
+    Args:
+        trace_path: Ruta del archivo de traza
+        targets: Ventanas objetivo (None = las buscadas durante la grabación)
+        realtime: Si es True respeta los tiempos grabados
+        match_mode: Modo de búsqueda ("contains" o "fuzzy")
+        fuzzy_threshold: Puntuación mínima en modo fuzzy
+
+    Returns:
+        Dict: ticks, cambios exitosos, tiempo total y tiempo medio por tick
+    """
+    controller = ReplayWindowController(trace_path, realtime=realtime)
+    if targets is None:
+        targets = list(dict.fromkeys(controller.recorded_queries()))
+    if not targets:
+        raise ValueError("La traza no contiene búsquedas y no se indicaron targets")
+
+    service = WindowSwitcherService(
+        controller=controller,
+        targets=list(targets),
+        interval_ms=0,
+        match_mode=match_mode,
+        fuzzy_threshold=fuzzy_threshold
+    )
+    service.start()
+
+    ticks = 0
+    switched = 0
+    start = time.perf_counter()
+    while not controller.exhausted:
+        if service.switch_to_next():
+            switched += 1
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    service.stop()
+
+    return {
+        "ticks": ticks,
+        "switched": switched,
+        "elapsed_s": round(elapsed, 6),
+        "us_per_tick": round(elapsed / ticks * 1e6, 3) if ticks else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una traza de ventanas grabada")
+    parser.add_argument("trace", help="Archivo de traza (.jsonl o .jsonl.gz)")
+    parser.add_argument("--realtime", action="store_true", help="Respetar los tiempos grabados")
+    parser.add_argument("--targets", nargs="+", help="Ventanas objetivo (por defecto, las grabadas)")
+    parser.add_argument("--match-mode", choices=[MATCH_CONTAINS, MATCH_FUZZY], default=MATCH_CONTAINS,
+                        help="Modo de búsqueda de ventanas")
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.6, help="Puntuación mínima en modo fuzzy")
+    args = parser.parse_args()
+
+    report = replay_trace(args.trace, args.targets, args.realtime, args.match_mode, args.fuzzy_threshold)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
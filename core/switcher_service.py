@@ -1,14 +1,44 @@
-from typing import List, Callable, Optional
+from typing import List, Dict, Callable, Optional, Tuple
 from controllers.base_controller import BaseWindowController
+from core.profiler import Profiler
+from core.title_index import TitleIndex
+from core.event_log import (
+    EventLog,
+    EVENT_TICK,
+    EVENT_RESOLVED,
+    EVENT_ACTIVATED,
+    EVENT_FAILED,
+    EVENT_SKIPPED,
+)
+
+
+MATCH_CONTAINS = "contains"
+MATCH_FUZZY = "fuzzy"
 
 
 class WindowSwitcherService:
     """Servicio que gestiona el cambio automático entre ventanas."""
 
-    def __init__(self, controller: BaseWindowController, targets: List[str], interval_ms: int):
+    def __init__(
+        self,
+        controller: BaseWindowController,
+        targets: List[str],
+        interval_ms: int,
+        event_log: Optional[EventLog] = None,
+        match_mode: str = MATCH_CONTAINS,
+        fuzzy_threshold: float = 0.6
+    ):
         self.controller = controller
         self.targets = targets
         self.interval_ms = interval_ms
+        self.event_log = event_log if event_log is not None else EventLog()
+        if match_mode not in (MATCH_CONTAINS, MATCH_FUZZY):
+            raise ValueError(f"Modo de búsqueda no soportado: {match_mode}")
+        self.match_mode = match_mode
+        self.fuzzy_threshold = fuzzy_threshold
+        self._title_index = TitleIndex()
+        self._last_match: Dict[str, int] = {}
+        self._profiler: Optional[Profiler] = None
         self._running = False
         self._current_index = 0
         self._on_status_change: Optional[Callable[[bool], None]] = None
@@ -35,29 +65,101 @@ class WindowSwitcherService:
         """Cambia a la siguiente ventana en la lista de objetivos."""
         if not self._running:
             return False
-
+        if self._profiler is not None:
+            return self._profiled_switch_to_next()
+        return self._switch_to_next()
+
+    def set_profiler(self, profiler: Optional[Profiler], controller: BaseWindowController) -> None:
+        """
+        Activa o desactiva el perfilado de ticks.
+        Desactivado, el tick no pasa por el perfilador y no añade coste.
+        
+        Args:
+            profiler: Perfilador a usar, o None para desactivarlo
+            controller: Controlador a usar desde ahora (el que mide las
+                        llamadas al activar, el original al desactivar)
+        """
+        self.controller = controller
+        self._profiler = profiler
+
+    def get_profiler(self) -> Optional[Profiler]:
+        """Obtiene el perfilador activo, o None si está desactivado."""
+        return self._profiler
+
+    def _profiled_switch_to_next(self) -> bool:
+        """Ejecuta un tick dentro de un span del perfilador (si está muestreado)."""
+        profiler = self._profiler
+        if not profiler.begin_tick():
+            return self._switch_to_next()
+        try:
+            with profiler.span("tick", target=self.targets[self._current_index]):
+                return self._switch_to_next()
+        finally:
+            profiler.end_tick()
+
+    def _switch_to_next(self) -> bool:
         target = self.targets[self._current_index]
-        window = self.controller.find_window_by_title_contains(target)
+        self.event_log.emit(EVENT_TICK, target=target, index=self._current_index)
+        window, score = self._find_window(target)
 
         if window:
+            self.event_log.emit(
+                EVENT_RESOLVED, target=target, title=window["title"], hwnd=window["hwnd"], score=score
+            )
             try:
-                print(f"Activando: {window['title']}")
                 success = self.controller.activate_window(window["hwnd"])
                 
                 if success:
+                    self.event_log.emit(EVENT_ACTIVATED, target=target, title=window["title"], hwnd=window["hwnd"])
                     self._current_index = (self._current_index + 1) % len(self.targets)
                     return True
                 else:
-                    print(f"No se pudo activar la ventana: {window['title']}")
+                    self.event_log.emit(
+                        EVENT_FAILED, target=target, title=window["title"], hwnd=window["hwnd"],
+                        reason="activation_refused"
+                    )
                     return False
                     
             except Exception as e:
-                print(f"Error al activar ventana: {e}")
+                self.event_log.emit(
+                    EVENT_FAILED, target=target, title=window["title"], hwnd=window["hwnd"],
+                    reason="exception", error=str(e)
+                )
                 return False
         else:
-            print(f"No se encontró ventana con título que contenga: {target}")
+            self.event_log.emit(EVENT_SKIPPED, target=target, reason="not_found")
             return False
 
+    def _find_window(self, target: str) -> Tuple[Optional[Dict], float]:
+        """
+        Busca la ventana de un target según el modo de búsqueda.
+        En modo fuzzy se mantiene la ventana elegida en ticks anteriores
+        mientras siga siendo una de las mejores coincidencias.
+        """
+        if self.match_mode == MATCH_CONTAINS:
+            window = self.controller.find_window_by_title_contains(target)
+            return window, 1.0
+
+        windows = self.controller.list_windows_for_lookup(target)
+        if self._profiler is not None:
+            with self._profiler.span("match", target=target):
+                match = self._match_fuzzy(target, windows)
+        else:
+            match = self._match_fuzzy(target, windows)
+        if match is None:
+            return None, 0.0
+
+        window, score = match
+        self._last_match[target] = window["hwnd"]
+        return window, round(score, 3)
+
+    def _match_fuzzy(self, target: str, windows: List[Dict]) -> Optional[Tuple[Dict, float]]:
+        """Actualiza el índice de títulos y obtiene la mejor coincidencia."""
+        self._title_index.update(windows)
+        return self._title_index.best_match(
+            target, self.fuzzy_threshold, preferred_hwnd=self._last_match.get(target)
+        )
+
     def reset_index(self) -> None:
         """Reinicia el índice de ventanas al inicio."""
         self._current_index = 0
@@ -73,11 +175,16 @@ class WindowSwitcherService:
         """Elimina una ventana objetivo. Retorna False si no existe."""
         if target in self.targets:
             self.targets.remove(target)
+            self._last_match.pop(target, None)
             if self._current_index >= len(self.targets) and len(self.targets) > 0:
                 self._current_index = 0
             return True
         return False
 
+    def get_recent_events(self, limit: Optional[int] = None) -> List[Dict]:
+        """Obtiene los eventos más recientes del registro."""
+        return self.event_log.recent(limit)
+
     def get_targets(self) -> List[str]:
         """Obtiene la lista actual de ventanas objetivo."""
         return self.targets.copy()
@@ -85,6 +192,7 @@ class WindowSwitcherService:
     def clear_targets(self) -> None:
         """Limpia todas las ventanas objetivo."""
         self.targets.clear()
+        self._last_match.clear()
         self._current_index = 0
 
     def _notify_status_change(self) -> None:
@@ -0,0 +1,373 @@
+"""
+Sincronización de la rotación entre varias instancias del switcher.
+
+Cada instancia conoce la lista ordenada de peers (host, puerto). El líder es
+el peer sincronizado de menor índice que responde; el resto estima su desfase
+de reloj respecto a él (ping/pong UDP, muestra de menor RTT) y programa cada
+cambio en el siguiente slot compartido: epoch + k * intervalo, en tiempo del
+cluster. Una instancia que arranca (o vuelve tras caerse) primero se
+sincroniza con el líder actual y solo entonces puede recuperar el liderazgo,
+de modo que el reloj del cluster no salta.
+
+Prueba con varios procesos en localhost e informe de desfase entre instancias:
+    python -m core.sync --nodes 3 --duration 30 --kill-leader-after 10 --restart-leader-after 18
+"""
+import argparse
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+class RotationSync:
+    """
+    Reloj compartido entre instancias para alinear los cambios de ventana.
+    Responde a los pings de otros peers y, si no es el líder, se sincroniza
+    con el peer de menor índice que esté vivo (failover automático).
+    """
+
+    # Número de muestras de desfase que se conservan del líder actual
+    SAMPLE_WINDOW = 8
+
+    # Muestras necesarias para considerarse sincronizado con el líder
+    SYNC_SAMPLES = 3
+
+    def __init__(
+        self,
+        node_id: int,
+        peers: List[Tuple[str, int]],
+        interval_ms: int,
+        epoch: float = 0.0,
+        ping_interval: float = 0.5,
+        leader_timeout: float = 2.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa la sincronización.
+
+        Args:
+            node_id: Índice de esta instancia en peers (0 = líder preferido)
+            peers: Direcciones UDP de todas las instancias, en orden de prioridad
+            interval_ms: Duración de cada slot de rotación
+            epoch: Instante (tiempo del cluster) en que empieza el slot 0
+            ping_interval: Segundos entre rondas de ping
+            leader_timeout: Segundos sin respuesta para dar un peer por caído
+            clock: Reloj local (segundos desde epoch)
+        """
+        if not 0 <= node_id < len(peers):
+            raise ValueError(f"node_id fuera de rango: {node_id}")
+
+        self.node_id = node_id
+        self.peers = peers
+        self.interval_ms = interval_ms
+        self.epoch = epoch
+        self.ping_interval = ping_interval
+        self.leader_timeout = leader_timeout
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._offset = 0.0
+        self._rtt: Optional[float] = None
+        self._leader = node_id
+        self._last_seen: Dict[int, float] = {}
+        self._peer_synced: Dict[int, bool] = {}
+        self._synced = False
+        self._started = 0.0
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=self.SAMPLE_WINDOW)
+        self._last_slot: Optional[int] = None
+
+        self._running = False
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Abre el socket UDP e inicia el hilo de sincronización."""
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(self.peers[self.node_id])
+        self._sock.settimeout(0.05)
+        self._started = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="rotation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo y cierra el socket."""
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def cluster_time(self) -> float:
+        """Hora actual en el reloj del cluster."""
+        with self._lock:
+            return self._clock() + self._offset
+
+    def next_slot_delay_ms(self) -> int:
+        """
+        Calcula cuánto falta para el siguiente slot compartido.
+        Nunca devuelve el mismo slot dos veces, aunque el temporizador se
+        dispare unos milisegundos antes de tiempo.
+
+        Returns:
+            int: Milisegundos hasta el inicio del siguiente slot
+        """
+        slot_s = self.interval_ms / 1000
+        now = self.cluster_time()
+        slot = math.floor((now - self.epoch) / slot_s) + 1
+        if self._last_slot is not None and slot <= self._last_slot:
+            slot = self._last_slot + 1
+        self._last_slot = slot
+        return max(0, round((self.epoch + slot * slot_s - now) * 1000))
+
+    @property
+    def last_slot(self) -> Optional[int]:
+        """Último slot devuelto por next_slot_delay_ms."""
+        return self._last_slot
+
+    def status(self) -> Dict:
+        """Estado actual: líder, desfase estimado y RTT."""
+        with self._lock:
+            return {
+                "node_id": self.node_id,
+                "leader": self._leader,
+                "synced": self._synced,
+                "offset_ms": round(self._offset * 1000, 3),
+                "rtt_ms": round(self._rtt * 1000, 3) if self._rtt is not None else None,
+            }
+
+    def _run(self) -> None:
+        next_ping = 0.0
+        while self._running:
+            now = time.monotonic()
+            if now >= next_ping:
+                self._ping_peers()
+                self._bootstrap(now)
+                self._elect_leader(now)
+                next_ping = now + self.ping_interval
+
+            try:
+                data, addr = self._sock.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                # En Windows un ICMP "port unreachable" llega como error del socket
+                continue
+            self._handle(data, addr)
+
+    def _ping_peers(self) -> None:
+        """Envía ping a todos los peers (para detectar líder, caídas y regresos)."""
+        for peer_id in range(len(self.peers)):
+            if peer_id != self.node_id:
+                message = {"type": "ping", "id": self.node_id, "t0": self._clock()}
+                self._send(message, self.peers[peer_id])
+
+    def _bootstrap(self, now: float) -> None:
+        """
+        Si tras leader_timeout no hay ningún peer sincronizado (arranque del
+        cluster completo) ni otro vivo con más prioridad, esta instancia se da
+        por sincronizada con su propio reloj y pasa a ser la referencia.
+        """
+        if self._synced or now - self._started < self.leader_timeout:
+            return
+        for peer_id, synced in self._peer_synced.items():
+            if self._is_alive(peer_id, now) and (synced or peer_id < self.node_id):
+                return
+        with self._lock:
+            self._synced = True
+
+    def _is_alive(self, peer_id: int, now: float) -> bool:
+        seen = self._last_seen.get(peer_id)
+        return seen is not None and now - seen <= self.leader_timeout
+
+    def _elect_leader(self, now: float) -> None:
+        """
+        El líder es la instancia sincronizada de menor índice que está viva.
+        Una instancia aún no sincronizada sigue al líder actual aunque tenga
+        más prioridad, hasta haber ajustado su reloj al del cluster.
+        """
+        candidates = [
+            peer_id for peer_id, synced in self._peer_synced.items()
+            if synced and self._is_alive(peer_id, now)
+        ]
+        if self._synced:
+            candidates.append(self.node_id)
+        leader = min(candidates) if candidates else self.node_id
+        with self._lock:
+            if leader != self._leader:
+                # Se conserva el desfase: el reloj del cluster continúa sin saltos
+                self._leader = leader
+                self._samples.clear()
+                self._rtt = None
+
+    def _handle(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """Procesa un datagrama; los mensajes mal formados se descartan."""
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        try:
+            if message.get("type") == "ping":
+                self._handle_ping(message, addr)
+            elif message.get("type") == "pong":
+                self._handle_pong(message)
+        except (KeyError, TypeError, ValueError):
+            return
+
+    def _handle_ping(self, message: Dict, addr: Tuple[str, int]) -> None:
+        t0 = float(message["t0"])
+        reply = {
+            "type": "pong", "id": self.node_id, "t0": t0,
+            "t1": self.cluster_time(), "synced": self._synced
+        }
+        self._send(reply, addr)
+
+    def _handle_pong(self, message: Dict) -> None:
+        t3 = self._clock()
+        peer_id = message["id"]
+        t0 = float(message["t0"])
+        t1 = float(message["t1"])
+        if not isinstance(peer_id, int) or not 0 <= peer_id < len(self.peers):
+            return
+        if not (math.isfinite(t0) and math.isfinite(t1)):
+            return
+
+        if peer_id == self.node_id:
+            return
+
+        self._last_seen[peer_id] = time.monotonic()
+        self._peer_synced[peer_id] = bool(message.get("synced", False))
+        self._elect_leader(time.monotonic())
+        if peer_id != self._leader:
+            return
+
+        rtt = t3 - t0
+        offset = t1 - (t0 + t3) / 2
+        with self._lock:
+            self._samples.append((rtt, offset))
+            # La muestra con menor RTT es la de menor error
+            self._rtt, self._offset = min(self._samples)
+            if len(self._samples) >= self.SYNC_SAMPLES:
+                self._synced = True
+
+    def _send(self, message: Dict, addr: Tuple[str, int]) -> None:
+        try:
+            self._sock.sendto(json.dumps(message).encode("utf-8"), addr)
+        except OSError:
+            pass
+
+
+def _run_probe(node_id: int, nodes: int, port_base: int, interval_ms: int,
+               duration: float, clock_offset: float) -> None:
+    """Instancia de prueba: imprime una línea JSON por cada slot disparado."""
+    peers = [("127.0.0.1", port_base + i) for i in range(nodes)]
+    sync = RotationSync(
+        node_id, peers, interval_ms,
+        clock=lambda: time.time() + clock_offset
+    )
+    sync.start()
+
+    end = time.time() + duration
+    while time.time() < end:
+        delay = sync.next_slot_delay_ms()
+        time.sleep(delay / 1000)
+        fired = time.time()
+        print(json.dumps({"node": node_id, "slot": sync.last_slot, "fired": fired, **sync.status()}), flush=True)
+
+    sync.stop()
+
+
+def _run_report(nodes: int, port_base: int, interval_ms: int, duration: float,
+                kill_leader_after: Optional[float], restart_leader_after: Optional[float],
+                warmup: float) -> Dict:
+    """
+    Lanza varias instancias con relojes desfasados y mide el desfase real.
+    Solo cuentan los disparos de instancias ya sincronizadas.
+    """
+    # Desfase de reloj artificial de hasta ±500 ms por instancia
+    clock_offsets = [random.uniform(-0.5, 0.5) for _ in range(nodes)]
+    began = time.time()
+
+    def spawn(node_id: int, node_duration: float) -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, "-m", "core.sync", "--probe", "--node-id", str(node_id),
+             "--nodes", str(nodes), "--port-base", str(port_base),
+             "--interval-ms", str(interval_ms), "--duration", str(node_duration),
+             "--clock-offset", str(clock_offsets[node_id])],
+            stdout=subprocess.PIPE, text=True
+        )
+
+    procs = [spawn(node_id, duration) for node_id in range(nodes)]
+
+    if kill_leader_after is not None:
+        time.sleep(max(0.0, began + kill_leader_after - time.time()))
+        procs[0].terminate()
+        if restart_leader_after is not None:
+            time.sleep(max(0.0, began + restart_leader_after - time.time()))
+            procs.append(spawn(0, began + duration - time.time()))
+
+    fired: Dict[int, Dict[int, float]] = {}
+    unsynced = 0
+    for proc in procs:
+        out, _ = proc.communicate()
+        for line in out.splitlines():
+            record = json.loads(line)
+            if not record["synced"]:
+                unsynced += 1
+                continue
+            fired.setdefault(record["slot"], {})[record["node"]] = record["fired"]
+
+    start = began + warmup
+    skews = sorted(
+        (max(times.values()) - min(times.values())) * 1000
+        for times in fired.values()
+        if len(times) > 1 and min(times.values()) >= start
+    )
+    if not skews:
+        return {"slots": 0, "unsynced_fires": unsynced}
+    return {
+        "slots": len(skews),
+        "unsynced_fires": unsynced,
+        "skew_ms_p50": round(skews[len(skews) // 2], 3),
+        "skew_ms_p95": round(skews[int(len(skews) * 0.95)], 3),
+        "skew_ms_max": round(skews[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de rotación sincronizada en localhost")
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--port-base", type=int, default=47800)
+    parser.add_argument("--interval-ms", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos iniciales excluidos del informe")
+    parser.add_argument("--kill-leader-after", type=float, help="Detener el nodo 0 tras N segundos")
+    parser.add_argument("--restart-leader-after", type=float,
+                        help="Volver a lanzar el nodo 0 tras N segundos (requiere --kill-leader-after)")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--node-id", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--clock-offset", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        _run_probe(args.node_id, args.nodes, args.port_base, args.interval_ms,
+                   args.duration, args.clock_offset)
+    else:
+        report = _run_report(args.nodes, args.port_base, args.interval_ms, args.duration,
+                             args.kill_leader_after, args.restart_leader_after, args.warmup)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
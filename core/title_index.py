@@ -0,0 +1,178 @@
+import re
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+# Solo palabras: los números (contadores, versiones) cambian entre ticks
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+
+def normalize_title(title: str) -> str:
+    """Normaliza un título: minúsculas y espacios simples."""
+    return " ".join(title.lower().split())
+
+
+def tokenize(title: str) -> FrozenSet[str]:
+    """Obtiene las palabras de un título sin números ni signos."""
+    return frozenset(_TOKEN_RE.findall(title.lower()))
+
+
+class TitleIndex:
+    """
+    Índice invertido de tokens sobre el snapshot actual de ventanas.
+    Se actualiza de forma incremental (solo se reindexan las ventanas nuevas
+    o cuyo título cambió) y permite buscar la ventana más parecida a un
+    texto puntuando solo las ventanas que comparten algún token con él.
+    """
+
+    # Margen de puntuación dentro del cual se mantiene la coincidencia anterior
+    STICKINESS = 0.1
+
+    def __init__(self):
+        self._windows: Dict[int, Dict] = {}
+        self._normalized: Dict[int, str] = {}
+        self._tokens: Dict[int, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def update(self, windows: Iterable[Dict]) -> None:
+        """
+        Sincroniza el índice con un nuevo snapshot de ventanas.
+
+        Args:
+            windows: Lista de ventanas con hwnd, title y pid
+        """
+        current = {w["hwnd"]: w for w in windows}
+
+        for hwnd in [h for h in self._windows if h not in current]:
+            self._remove(hwnd)
+
+        for hwnd, window in current.items():
+            previous = self._windows.get(hwnd)
+            if previous is None or previous["title"] != window["title"]:
+                self._remove(hwnd)
+                self._add(window)
+            else:
+                self._windows[hwnd] = window
+
+    def best_match(
+        self,
+        text: str,
+        threshold: float,
+        preferred_hwnd: Optional[int] = None
+    ) -> Optional[Tuple[Dict, float]]:
+        """
+        Obtiene la mejor coincidencia para un texto.
+        Si la ventana elegida anteriormente sigue siendo una coincidencia casi
+        tan buena como la mejor, se mantiene para que la elección sea estable.
+
+        Args:
+            text: Texto a buscar
+            threshold: Puntuación mínima (0.0 - 1.0)
+            preferred_hwnd: Ventana elegida en el tick anterior
+
+        Returns:
+            Optional[Tuple[Dict, float]]: Ventana y puntuación, o None
+        """
+        query = normalize_title(text)
+        best: Optional[Tuple[Dict, float]] = None
+        preferred: Optional[Tuple[Dict, float]] = None
+
+        for bound, jaccard, hwnd in self._candidates(text):
+            # Ningún candidato restante puede superar al mejor ni al mínimo
+            minimum = threshold if best is None else max(threshold, best[1])
+            if bound < minimum or (best is not None and best[1] >= 1.0):
+                break
+            score = self._score(query, jaccard, hwnd, minimum)
+            if score < minimum:
+                continue
+            if best is None or (score, -hwnd) > (best[1], -best[0]["hwnd"]):
+                best = (self._windows[hwnd], score)
+            if hwnd == preferred_hwnd:
+                preferred = (self._windows[hwnd], score)
+
+        if best is None:
+            return None
+
+        if preferred is None and preferred_hwnd in self._windows:
+            score = self._score_hwnd(text, preferred_hwnd)
+            if score >= threshold:
+                preferred = (self._windows[preferred_hwnd], score)
+
+        if preferred is not None and preferred[1] >= best[1] - self.STICKINESS:
+            return preferred
+        return best
+
+    def _candidates(self, text: str) -> List[Tuple[float, float, int]]:
+        """
+        Obtiene las ventanas que comparten algún token con el texto, con una
+        cota superior de su puntuación, ordenadas de mayor a menor cota.
+
+        Returns:
+            List[Tuple[float, float, int]]: (cota, jaccard, hwnd)
+        """
+        query = normalize_title(text)
+        query_tokens = tokenize(text)
+
+        if not query_tokens:
+            # Sin palabras (p. ej. solo números): búsqueda por subcadena
+            return [(1.0, 0.0, hwnd) for hwnd, title in self._normalized.items() if query in title]
+
+        overlaps: Dict[int, int] = {}
+        for token in query_tokens:
+            for hwnd in self._postings.get(token, ()):
+                overlaps[hwnd] = overlaps.get(hwnd, 0) + 1
+
+        candidates = []
+        for hwnd, overlap in overlaps.items():
+            jaccard = overlap / (len(query_tokens) + len(self._tokens[hwnd]) - overlap)
+            # Solo puede valer 1.0 si contiene el texto completo
+            if overlap == len(query_tokens) and query in self._normalized[hwnd]:
+                bound = 1.0
+            else:
+                bound = (jaccard + 1) / 2
+            candidates.append((bound, jaccard, hwnd))
+
+        candidates.sort(key=lambda c: -c[0])
+        return candidates
+
+    def _score_hwnd(self, text: str, hwnd: int) -> float:
+        """Puntúa una ventana concreta contra el texto."""
+        query_tokens = tokenize(text)
+        tokens = self._tokens[hwnd]
+        union = len(query_tokens | tokens)
+        jaccard = len(query_tokens & tokens) / union if union else 0.0
+        return self._score(normalize_title(text), jaccard, hwnd)
+
+    def _score(self, query: str, jaccard: float, hwnd: int, minimum: float = 0.0) -> float:
+        """
+        Combina solapamiento de tokens (Jaccard) y similitud de edición.
+        Devuelve 0.0 sin calcular la similitud completa si una cota rápida
+        indica que no se puede alcanzar el mínimo.
+        """
+        title = self._normalized[hwnd]
+        if query in title:
+            return 1.0
+        matcher = SequenceMatcher(None, query, title)
+        if (jaccard + matcher.quick_ratio()) / 2 < minimum:
+            return 0.0
+        return (jaccard + matcher.ratio()) / 2
+
+    def _add(self, window: Dict) -> None:
+        hwnd = window["hwnd"]
+        tokens = tokenize(window["title"])
+        self._windows[hwnd] = window
+        self._normalized[hwnd] = normalize_title(window["title"])
+        self._tokens[hwnd] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(hwnd)
+
+    def _remove(self, hwnd: int) -> None:
+        if hwnd not in self._windows:
+            return
+        for token in self._tokens.pop(hwnd):
+            postings = self._postings[token]
+            postings.discard(hwnd)
+            if not postings:
+                del self._postings[token]
+        del self._windows[hwnd]
+        del self._normalized[hwnd]
@@ -1,7 +1,24 @@
+import argparse
+import os
+import time
+from typing import Optional
+
 from config import settings
 from utils.os_detect import get_os
 from controllers.windows_controller import WindowsWindowController
+from controllers.recording_controller import RecordingWindowController
+from controllers.profiling_controller import ProfilingWindowController
 from core.switcher_service import WindowSwitcherService
+from core.sync import RotationSync
+from core.profiler import Profiler
+from core.event_log import (
+    EventLog,
+    EVENT_TARGET_ADDED,
+    EVENT_TARGET_REMOVED,
+    EVENT_WINDOWS_REFRESHED,
+    EVENT_PROFILE_EXPORTED,
+    EVENT_PROFILE_EXPORT_FAILED,
+)
 from ui.gui import WindowSwitcherGUI
 
 
@@ -11,7 +28,9 @@ class Application:
     def __init__(self):
         self._validate_os()
         self._init_controller()
+        self._init_event_log()
         self._init_service()
+        self._init_sync()
         self._init_ui()
         self._connect_components()
 
@@ -30,15 +49,45 @@ class Application:
         self.controller = WindowsWindowController()
         print("[OK] Controlador de ventanas inicializado")
 
+        if settings.RECORD_TRACE_PATH:
+            self.controller = RecordingWindowController(self.controller, settings.RECORD_TRACE_PATH)
+            print(f"[OK] Grabando traza en: {settings.RECORD_TRACE_PATH}")
+
+    def _init_event_log(self) -> None:
+        """Inicializa el registro estructurado de eventos."""
+        self.event_log = EventLog(
+            capacity=settings.EVENT_LOG_CAPACITY,
+            log_dir=settings.EVENT_LOG_DIR,
+            max_bytes=settings.EVENT_LOG_MAX_BYTES,
+            backup_count=settings.EVENT_LOG_BACKUP_COUNT
+        )
+        print("[OK] Registro de eventos inicializado")
+
     def _init_service(self) -> None:
         """Inicializa el servicio de cambio de ventanas."""
         self.service = WindowSwitcherService(
             controller=self.controller,
             targets=settings.TARGETS,
-            interval_ms=settings.INTERVAL_MS
+            interval_ms=settings.INTERVAL_MS,
+            event_log=self.event_log,
+            match_mode=settings.MATCH_MODE,
+            fuzzy_threshold=settings.FUZZY_THRESHOLD
         )
         print(f"[OK] Servicio inicializado con {len(settings.TARGETS)} ventanas objetivo")
 
+    def _init_sync(self) -> None:
+        """Inicializa la sincronización con otras instancias (opcional)."""
+        self.sync = None
+        if settings.SYNC_ENABLED:
+            self.sync = RotationSync(
+                node_id=settings.SYNC_NODE_ID,
+                peers=settings.SYNC_PEERS,
+                interval_ms=settings.INTERVAL_MS,
+                epoch=settings.SYNC_EPOCH
+            )
+            self.sync.start()
+            print(f"[OK] Sincronización iniciada como nodo {settings.SYNC_NODE_ID}")
+
     def _init_ui(self) -> None:
         """Inicializa la interfaz gráfica."""
         self.gui = WindowSwitcherGUI(
@@ -59,19 +108,30 @@ class Application:
         self.gui.set_add_target_callback(self._on_add_target)
         self.gui.set_remove_target_callback(self._on_remove_target)
         self.gui.set_refresh_windows_callback(self._on_refresh_windows)
+        self.gui.set_events_callback(self._on_show_events)
+        self.gui.set_toggle_profiling_callback(self._on_toggle_profiling)
 
         # Conectar cambios de estado del servicio con la UI
         self.service.set_status_callback(self.gui.update_status)
         
         # Actualizar la lista inicial de targets en la GUI
         self.gui.update_targets_list(self.service.get_targets())
+
+        # Perfilado activado desde configuración o CLI
+        if settings.PROFILE_ENABLED:
+            self._on_toggle_profiling(True)
+            self.gui.set_profiling_state(True)
         
         print("[OK] Componentes conectados")
 
     def _on_start(self) -> None:
         """Inicia el servicio y programa el primer cambio."""
         self.service.start()
-        self._schedule_next_switch()
+        if self.sync:
+            # Esperar al siguiente slot compartido antes del primer cambio
+            self.gui.schedule_task(self.sync.next_slot_delay_ms(), self._schedule_next_switch)
+        else:
+            self._schedule_next_switch()
 
     def _on_stop(self) -> None:
         """Detiene el servicio."""
@@ -83,39 +143,115 @@ class Application:
             return
 
         self.service.switch_to_next()
-        self.gui.schedule_task(settings.INTERVAL_MS, self._schedule_next_switch)
+        delay_ms = self.sync.next_slot_delay_ms() if self.sync else settings.INTERVAL_MS
+        self.gui.schedule_task(delay_ms, self._schedule_next_switch)
 
     def _on_add_target(self, target: str) -> None:
         """Añade un nuevo target y actualiza la GUI."""
-        if self.service.add_target(target):
-            print(f"[INFO] Target añadido: {target}")
+        added = self.service.add_target(target)
+        self.event_log.emit(EVENT_TARGET_ADDED, target=target, ok=added)
+        if added:
             self.gui.update_targets_list(self.service.get_targets())
-        else:
-            print(f"[WARN] El target ya existe: {target}")
 
     def _on_remove_target(self, target: str) -> None:
         """Elimina un target y actualiza la GUI."""
-        if self.service.remove_target(target):
-            print(f"[INFO] Target eliminado: {target}")
+        removed = self.service.remove_target(target)
+        self.event_log.emit(EVENT_TARGET_REMOVED, target=target, ok=removed)
+        if removed:
             self.gui.update_targets_list(self.service.get_targets())
-        else:
-            print(f"[WARN] El target no existe: {target}")
 
     def _on_refresh_windows(self) -> list:
         """Obtiene la lista actualizada de ventanas abiertas."""
         windows = self.controller.get_application_windows()
-        print(f"[INFO] Ventanas disponibles actualizadas: {len(windows)} encontradas")
+        self.event_log.emit(EVENT_WINDOWS_REFRESHED, count=len(windows))
         return windows
 
+    def _on_show_events(self) -> list:
+        """Obtiene los eventos recientes para mostrarlos en la GUI."""
+        return self.service.get_recent_events(settings.EVENT_LOG_VIEW_LIMIT)
+
+    def _on_toggle_profiling(self, enabled: bool) -> None:
+        """Activa el perfilado, o lo desactiva exportando la traza."""
+        if enabled:
+            if self.service.get_profiler() is None:
+                profiler = Profiler(
+                    sample_rate=settings.PROFILE_SAMPLE_RATE,
+                    max_events=settings.PROFILE_MAX_EVENTS
+                )
+                self.service.set_profiler(profiler, ProfilingWindowController(self.controller, profiler))
+        else:
+            # Primero se desactiva, para que un fallo al exportar no lo deje activo
+            profiler = self.service.get_profiler()
+            if isinstance(self.service.controller, ProfilingWindowController):
+                self.service.controller.detach()
+            self.service.set_profiler(None, self.controller)
+            self._export_profile(profiler)
+
+    def _export_profile(self, profiler: Optional[Profiler] = None) -> None:
+        """
+        Exporta la traza de un perfilador en formato Chrome trace-event.
+
+        Args:
+            profiler: Perfilador a exportar (por defecto, el activo)
+        """
+        if profiler is None:
+            profiler = self.service.get_profiler()
+        if profiler is None or not profiler.events():
+            return
+        now = time.time()
+        name = time.strftime("trace-%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}.json"
+        path = os.path.join(settings.PROFILE_DIR, name)
+        try:
+            count = profiler.export(path)
+        except OSError as e:
+            print(f"[WARN] No se pudo exportar el perfil: {e}")
+            self.event_log.emit(EVENT_PROFILE_EXPORT_FAILED, path=path, error=str(e))
+            return
+        self.event_log.emit(EVENT_PROFILE_EXPORTED, path=path, spans=count)
+
     def run(self) -> None:
         """Inicia la aplicación."""
         print("\n" + "="*50)
         print("Window Switcher - Aplicacion iniciada")
         print("="*50 + "\n")
-        self.gui.run()
+        try:
+            self.gui.run()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        """Libera los recursos; cada paso se ejecuta aunque falle el anterior."""
+        steps = [self._export_profile, self.event_log.close]
+        if self.sync:
+            steps.append(self.sync.stop)
+        if isinstance(self.controller, RecordingWindowController):
+            steps.append(self.controller.close)
+
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                print(f"[ERROR] Fallo al cerrar ({step.__qualname__}): {e}")
+
+
+def _parse_args() -> None:
+    """Aplica sobre la configuración las opciones de línea de comandos."""
+    parser = argparse.ArgumentParser(description=settings.WINDOW_TITLE)
+    parser.add_argument("--profile", action="store_true", help="Activar el perfilado desde el inicio")
+    parser.add_argument("--profile-sample-rate", type=float, help="Fracción de ticks perfilados (0.0 - 1.0)")
+    parser.add_argument("--profile-dir", help="Directorio de las trazas exportadas")
+    args = parser.parse_args()
+
+    if args.profile:
+        settings.PROFILE_ENABLED = True
+    if args.profile_sample_rate is not None:
+        settings.PROFILE_SAMPLE_RATE = args.profile_sample_rate
+    if args.profile_dir:
+        settings.PROFILE_DIR = args.profile_dir
 
 
 def main():
+    _parse_args()
     try:
         app = Application()
         app.run()
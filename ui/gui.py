@@ -1,6 +1,7 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from typing import Callable, List
+import time
+from typing import Callable, Dict, List
 
 
 class WindowSwitcherGUI:
@@ -33,7 +34,7 @@ class WindowSwitcherGUI:
         self.expanded_width = width
         self.expanded_height = height
         self.compact_width = 200
-        self.compact_height = 100
+        self.compact_height = 140
         
         # Iniciar en modo expandido
         self.is_compact = False
@@ -41,7 +42,7 @@ class WindowSwitcherGUI:
         self.root.resizable(True, True)
         
         # Establecer tamaño mínimo
-        self.root.minsize(180, 100)
+        self.root.minsize(180, 140)
         
         if always_on_top:
             self.root.attributes("-topmost", True)
@@ -52,6 +53,8 @@ class WindowSwitcherGUI:
         self._on_add_target: Callable[[str], None] = lambda x: None
         self._on_remove_target: Callable[[str], None] = lambda x: None
         self._on_refresh_windows: Callable[[], List[str]] = lambda: []
+        self._on_show_events: Callable[[], List[Dict]] = lambda: []
+        self._on_toggle_profiling: Callable[[bool], None] = lambda x: None
         
         # Estado inicial
         self._is_running = False
@@ -103,6 +106,26 @@ class WindowSwitcherGUI:
         )
         # self.status_indicator.grid(row=0, column=2, sticky="ns")
 
+        # Botón Eventos (visible también en modo compacto)
+        self.events_btn = ttk.Button(
+            self.control_frame,
+            text="📜 Eventos",
+            bootstyle="secondary-outline",
+            command=self._handle_show_events
+        )
+        self.events_btn.grid(row=1, column=0, sticky="ew", padx=(0, 5), pady=(10, 0))
+
+        # Interruptor de perfilado
+        self.profiling_var = ttk.BooleanVar(value=False)
+        self.profiling_toggle = ttk.Checkbutton(
+            self.control_frame,
+            text="⏱ Perfilado",
+            bootstyle="round-toggle",
+            variable=self.profiling_var,
+            command=self._handle_toggle_profiling
+        )
+        self.profiling_toggle.grid(row=1, column=1, sticky="w", padx=(5, 0), pady=(10, 0))
+
         # ===== SECCIÓN DE SELECCIÓN DE VENTANAS (COLAPSABLE) =====
         self.selection_frame = ttk.Labelframe(self.main_frame, text="Seleccionar Ventana", padding=10)
         self.selection_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
@@ -177,7 +200,7 @@ class WindowSwitcherGUI:
             command=self._handle_remove_target
         )
         self.remove_btn.grid(row=1, column=0, sticky="ew", pady=(10, 0))
-        
+
         # Cargar ventanas disponibles al inicio
         self.root.after(100, self._handle_refresh_windows)
 
@@ -238,6 +261,24 @@ class WindowSwitcherGUI:
         """
         self._on_refresh_windows = callback
 
+    def set_events_callback(self, callback: Callable[[], List[Dict]]) -> None:
+        """
+        Establece el callback para obtener los eventos recientes.
+        """
+        self._on_show_events = callback
+
+    def set_toggle_profiling_callback(self, callback: Callable[[bool], None]) -> None:
+        """
+        Establece el callback para activar o desactivar el perfilado.
+        """
+        self._on_toggle_profiling = callback
+
+    def set_profiling_state(self, enabled: bool) -> None:
+        """
+        Refleja en el interruptor si el perfilado está activo.
+        """
+        self.profiling_var.set(enabled)
+
     def update_status(self, is_running: bool) -> None:
         """
         Actualiza el estado visual de la interfaz.
@@ -300,6 +341,49 @@ class WindowSwitcherGUI:
         if windows:
             self.window_combo.current(0)
 
+    def _handle_show_events(self) -> None:
+        """Muestra los eventos recientes en una ventana aparte."""
+        events = self._on_show_events()
+
+        window = ttk.Toplevel(self.root)
+        window.title("Eventos recientes")
+        window.geometry("520x300")
+        window.attributes("-topmost", True)
+
+        frame = ttk.Frame(window, padding=10)
+        frame.pack(fill=BOTH, expand=YES)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        scrollbar = ttk.Scrollbar(frame, orient=VERTICAL)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        tree = ttk.Treeview(
+            frame,
+            columns=("time", "type", "detail"),
+            show="headings",
+            yscrollcommand=scrollbar.set
+        )
+        tree.heading("time", text="Hora")
+        tree.heading("type", text="Evento")
+        tree.heading("detail", text="Detalle")
+        tree.column("time", width=70, stretch=False)
+        tree.column("type", width=110, stretch=False)
+        tree.grid(row=0, column=0, sticky="nsew")
+        scrollbar.config(command=tree.yview)
+
+        # Mostrar primero los más recientes
+        for event in reversed(events):
+            hour = time.strftime("%H:%M:%S", time.localtime(event["ts"]))
+            detail = ", ".join(
+                f"{k}={v}" for k, v in event.items() if k not in ("ts", "type", "seq")
+            )
+            tree.insert("", "end", values=(hour, event["type"], detail))
+
+    def _handle_toggle_profiling(self) -> None:
+        """Maneja el evento de activar o desactivar el perfilado."""
+        self._on_toggle_profiling(self.profiling_var.get())
+
     def focus(self) -> None:
         """Trae el foco a la ventana de la aplicación."""
         self.root.focus_force()